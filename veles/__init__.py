@@ -123,6 +123,33 @@ def __html__():
         show_file(page)
 
 
+def install_reactor():
+    """
+    Explicitly installs the most scalable Twisted reactor for the current
+    platform: epoll on Linux and kqueue on BSD/OS X. The default one may fall
+    back to poll() which is O(number of descriptors) on every iteration, while
+    the master keeps a connection per slave. This must be called before
+    anybody imports twisted.internet.reactor.
+    """
+    import sys
+    from twisted.internet.error import ReactorAlreadyInstalledError
+    if sys.platform.startswith("linux"):
+        from twisted.internet import epollreactor as preferred
+    elif sys.platform.startswith(("darwin", "freebsd", "openbsd", "netbsd")):
+        from twisted.internet import kqreactor as preferred
+    else:
+        return
+    try:
+        preferred.install()
+    except ReactorAlreadyInstalledError:
+        from twisted.internet import reactor
+        if type(reactor).__module__ != preferred.__name__:
+            import logging
+            logging.getLogger(__name__).warning(
+                "%s has already been installed, so %s will not be used",
+                type(reactor).__name__, preferred.__name__)
+
+
 class VelesModule(ModuleType):
     """Redefined module class with added properties which are lazily evaluated.
     """
@@ -68,6 +68,8 @@ from veles.dot_pip import install_dot_pip
 
 # Enable locally installed dependencies
 install_dot_pip()
+# Must go before anything imports twisted.internet.reactor
+veles.install_reactor()
 
 # 3rd party imports go here
 import numpy
@@ -366,8 +368,7 @@ class Main(Logger, CommandLineBase):
         daemon_context = daemon.DaemonContext()
         daemon_context.working_directory = os.getcwd()
         daemon_context.files_preserve = [
-            int(fd) for fd in os.listdir("/proc/self/fd")
-            if int(fd) > 2]
+            fd for fd in map(int, os.listdir("/proc/self/fd")) if fd > 2]
         daemon_context.open()  # <- the magic happens here
 
     @staticmethod
@@ -45,6 +45,7 @@ try:
 except (ImportError, AttributeError):
     jit = None
 import numpy
+import opencl4py as cl
 import os
 import re
 from six import BytesIO, add_metaclass, PY3
@@ -55,7 +56,7 @@ from zope.interface import implementer, Interface
 
 from veles.compat import from_none
 from veles.config import root
-from veles.memory import Array, roundup
+from veles.memory import Array, aligned_empty, roundup
 import veles.opencl_types as opencl_types
 from veles.backends import Device, OpenCLDevice, CUDADevice, NumpyDevice
 from veles.pickle2 import pickle, best_protocol
@@ -701,26 +702,58 @@ class DeviceBenchmark(AcceleratedUnit):
     Executes an OpenCL benchmark to estimate the computing power of the device.
     """
 
+    _inputs_cache = {}
+
     def __init__(self, workflow, **kwargs):
         super(DeviceBenchmark, self).__init__(workflow, **kwargs)
         self.precision = kwargs.get("dtype", root.common.engine.precision_type)
         self.dtype = opencl_types.dtypes[self.precision]
         self.size = kwargs.get("size", 1500)
         self.repeats = kwargs.get("repeats", 10)
-        self._input_A_ = Array()
-        self._input_B_ = Array()
-        msize = self.size * self.size
-        from veles.prng.random_generator import RandomGenerator
-        rnd = RandomGenerator(None)
-        genmem = lambda: rnd.rand(msize).astype(self.dtype) - 0.5
-        self._input_A_.mem = genmem()
-        self._input_B_.mem = genmem()
+        self._input_A_, self._input_B_ = DeviceBenchmark._get_inputs(
+            self.dtype, self.size)
         self.block_size = kwargs.get("block_size")
         self.vector_opt = kwargs.get("vector_opt")
         self.precision_level = kwargs.get("precision_level",
                                           root.common.engine.precision_level)
         self.return_time = kwargs.get("return_time", False)
         self.dry_run_first = kwargs.get("dry_run_first", False)
+        # Measure the kernel execution time on the device (OpenCL only)
+        self.profile = kwargs.get("profile", False)
+
+    @staticmethod
+    def _get_inputs(dtype, size):
+        """Returns two random square matrices. The benchmark is created once
+        per tested kernel configuration, so the last pair is cached together
+        with its device buffers instead of generating and uploading hundreds
+        of megabytes each time.
+        """
+        key = (numpy.dtype(dtype), size)
+        inputs = DeviceBenchmark._inputs_cache.get(key)
+        if inputs is not None:
+            return inputs
+        DeviceBenchmark.release_inputs()
+        from veles.prng.random_generator import RandomGenerator
+        rnd = RandomGenerator(None)
+        inputs = Array(), Array()
+        for vec in inputs:
+            # Page aligned to be used with CL_MEM_USE_HOST_PTR without
+            # the copy in Array.realign_mem()
+            mem = aligned_empty(size * size, dtype, 4096)
+            mem[:] = rnd.rand(size * size)
+            mem -= 0.5
+            vec.mem = mem
+        DeviceBenchmark._inputs_cache[key] = inputs
+        return inputs
+
+    @staticmethod
+    def release_inputs():
+        """Frees the cached matrices and their device buffers.
+        """
+        for vecs in DeviceBenchmark._inputs_cache.values():
+            for vec in vecs:
+                vec.reset()
+        DeviceBenchmark._inputs_cache.clear()
 
     def initialize(self, device, **kwargs):
         """Compiles the benchmarking kernel.
@@ -771,10 +804,16 @@ class DeviceBenchmark(AcceleratedUnit):
         return res
 
     def numpy_run(self):
+        # The same product as in OpenCL and CUDA, C = A * A^T. A^T must be
+        # a separate buffer: numpy calls syrk() instead of gemm() for a
+        # transposed view of the same array, which does half of the work
+        a = self._input_A_.mem
+        at = numpy.ascontiguousarray(a.transpose())
+        c = self._input_B_.mem
+
         def execute(repeats):
             for _ in range(repeats):
-                numpy.dot(self._input_A_.mem, self._input_A_.mem,
-                          self._input_B_.mem)
+                numpy.dot(a, at, c)
 
         if self.dry_run_first:
             execute(1)
@@ -784,18 +823,37 @@ class DeviceBenchmark(AcceleratedUnit):
     def ocl_run(self):
         global_size = (roundup(self.size, self.block_size),) * 2
         local_size = (self.block_size,) * 2
-        self.device.queue_.flush()
-        self.device.queue_.finish()
-
+        queue = self.device.queue_
+        kernel = self._kernel_
+        queue.finish()
+        if self.profile:
+            queue = queue.context.create_queue(
+                queue.device, cl.CL_QUEUE_PROFILING_ENABLE)
+
+        # The kernels are enqueued without events and wait lists; clFinish()
+        # implies clFlush(), so the host synchronizes only once per execute()
         def execute(repeats):
             for _ in range(repeats):
-                self.execute_kernel(global_size, local_size)
-            self.device.queue_.flush()
-            self.device.queue_.finish()
+                queue.execute_kernel(kernel, global_size, local_size,
+                                     need_event=False)
+            queue.finish()
+
+        def execute_profiled(repeats):
+            events = [queue.execute_kernel(kernel, global_size, local_size)
+                      for _ in range(repeats)]
+            queue.finish()
+            dt = 0
+            for event in events:
+                values = event.get_profiling_info()[0]
+                dt += (values[cl.CL_PROFILING_COMMAND_END] -
+                       values[cl.CL_PROFILING_COMMAND_START])
+            return dt
 
         if self.dry_run_first:
             execute(1)
 
+        if self.profile:
+            return execute_profiled(self.repeats)
         return timeit(execute, self.repeats)[1]
 
     def cuda_run(self):
@@ -844,9 +902,12 @@ class AcceleratedWorkflow(Workflow):
                 self._power_measure_time_interval):
             self._last_power_measurement_time = now
             with self:
-                bench = DeviceBenchmark(self)
-                bench.initialize(self.device)
-                self._power_ = bench.run()
+                try:
+                    bench = DeviceBenchmark(self)
+                    bench.initialize(self.device)
+                    self._power_ = bench.run()
+                finally:
+                    DeviceBenchmark.release_inputs()
             self.info("Computing power is %.2f", self._power_)
         return self._power_
 
@@ -44,6 +44,7 @@ import numpy
 import opencl4py as cl
 import os
 from psutil import virtual_memory
+import random
 from six import add_metaclass
 import sys
 from threading import current_thread
@@ -436,6 +437,11 @@ class OpenCLDevice(Device):
     BACKEND = "ocl"
     PRIORITY = 20
     DEVICE_INFOS_JSON = "device_infos.json"
+    # Matrix size for the kernel tuning: a multiple of every block size
+    # which is a power of 2, so that these tiles do not do padding work
+    BENCHMARK_SIZE = 3072
+    # device_infos.json stores the times measured on 3001x3001 matrices
+    BENCHMARK_REFERENCE_SIZE = 3001
     ASYNC = True
     skip = cl.skip
 
@@ -624,10 +630,6 @@ class OpenCLDevice(Device):
         device_infos = {}
         found_any = False
         for devdir in root.common.engine.device_dirs:
-            try:
-                os.makedirs(devdir, 0o755)
-            except OSError:
-                pass
             device_infos_fnme = os.path.join(devdir,
                                              OpenCLDevice.DEVICE_INFOS_JSON)
             try:
@@ -653,6 +655,10 @@ class OpenCLDevice(Device):
             self._find_optimal_bs_vo(device_infos)
             found_any = False
             for devdir in root.common.engine.device_dirs:
+                try:
+                    os.makedirs(devdir, 0o755)
+                except OSError:
+                    pass
                 device_infos_fnme = os.path.join(
                     devdir, OpenCLDevice.DEVICE_INFOS_JSON)
                 try:
@@ -674,61 +680,145 @@ class OpenCLDevice(Device):
         krnnme = "matrix_multiplication"
         if krnnme not in device_info:
             device_info[krnnme] = {}
+        opencl_units = import_module("veles.accelerated_units")
+        try:
+            for dtype in root.common.engine.test_precision_types:
+                if dtype not in device_info[krnnme]:
+                    device_info[krnnme][dtype] = {}
+                # json wants strings
+                for precision_level in (
+                        str(p) for p in
+                        root.common.engine.test_precision_levels):
+                    best = self._tune_matrix_multiplication(
+                        krnnme, dtype, precision_level)
+                    if best is not None:
+                        device_info[krnnme][dtype][precision_level] = best
+        finally:
+            opencl_units.DeviceBenchmark.release_inputs()
+        device_infos[self.device_info.desc] = device_info
+
+    def _matrix_multiplication_configs(self, dtype):
+        """Enumerates (block_size, vector_opt) pairs supported by the device.
+        """
+        for vector_opt in (False, True):
+            max_block_size = self.device_info.get_max_block_size(
+                dtype, vector_opt)
+            min_block_size = 8
+            if vector_opt:
+                min_block_size >>= 2
+                min_block_size <<= 2
+                bs_inc = 4
+            else:
+                bs_inc = 1
+            for block_size in range(min_block_size, max_block_size + 1,
+                                    bs_inc):
+                yield block_size, vector_opt
+
+    def _tune_matrix_multiplication(self, krnnme, dtype, precision_level):
+        """Searches for the fastest matrix multiplication configuration.
+
+        If root.common.engine.test_max_configs is not set or is bigger than
+        the search space, every configuration is benchmarked. Otherwise, half
+        of the budget is spent on a random sample and the rest on the greedy
+        descent from the best sampled configuration over the neighbouring
+        block sizes (the approach of CLTune). The configurations are ranked
+        by the profiled kernel time, the winner's wall clock time is stored.
+
+        Returns:
+            (BLOCK_SIZE, VECTOR_OPT, time) or None if nothing could be run.
+        """
+        space = list(self._matrix_multiplication_configs(dtype))
+        budget = root.common.engine.test_max_configs or len(space)
+        measured = {}
+        # Block sizes which do not fit, per vector_opt
+        oversized = {False: 1 << 30, True: 1 << 30}
+
+        def evaluate(config):
+            block_size, vector_opt = config
+            if config in measured or len(measured) >= budget:
+                return
+            if block_size >= oversized[vector_opt]:
+                measured[config] = None
+                return
+            measured[config] = self._benchmark_matrix_multiplication(
+                krnnme, dtype, precision_level, block_size, vector_opt)
+            if measured[config] is False:
+                oversized[vector_opt] = min(oversized[vector_opt], block_size)
+                measured[config] = None
+
+        def best():
+            times = [(dt, config) for config, dt in measured.items()
+                     if dt is not None]
+            return min(times) if len(times) > 0 else (None, None)
+
+        if budget >= len(space):
+            for config in space:
+                evaluate(config)
+        else:
+            for config in random.sample(space, max(budget // 2, 1)):
+                evaluate(config)
+            improved = True
+            while improved and len(measured) < budget:
+                min_dt, config = best()
+                if min_dt is None:
+                    break
+                block_size, vector_opt = config
+                step = 4 if vector_opt else 1
+                for config in ((block_size - step, vector_opt),
+                               (block_size + step, vector_opt),
+                               (block_size, not vector_opt)):
+                    if config in space:
+                        evaluate(config)
+                improved = best()[0] < min_dt
+        min_dt, config = best()
+        if min_dt is None:
+            return None
+        # The profiled times exclude the launch overhead, while the stored
+        # ones are compared with the wall clock times of other devices
+        dt = self._benchmark_matrix_multiplication(
+            krnnme, dtype, precision_level, config[0], config[1],
+            profile=False)
+        if not dt:
+            return None
+        return config[0], bool(config[1]), dt
+
+    def _benchmark_matrix_multiplication(self, krnnme, dtype, precision_level,
+                                         block_size, vector_opt,
+                                         profile=True):
+        """Returns the measured time, None if the configuration failed or
+        False if it does not fit into the device's resources. If profile is
+        True, the time is the sum of the kernel execution times reported by
+        the device, otherwise it is the wall clock time.
+        """
         # FIXME(v.markovtsev): disable R0401 locally when pylint issue is fixed
         # https://bitbucket.org/logilab/pylint/issue/61
         # pylint: disable=R0401
         dummy = import_module("veles.dummy")
         opencl_units = import_module("veles.accelerated_units")
         benchmark = opencl_units.DeviceBenchmark
-        for dtype in root.common.engine.test_precision_types:
-            if dtype not in device_info[krnnme]:
-                device_info[krnnme][dtype] = {}
-            # json wants strings
-            for precision_level in (
-                    str(p) for p in root.common.engine.test_precision_levels):
-                min_dt = 1.0e30
-                for vector_opt in (False, True):
-                    max_block_size = self.device_info.get_max_block_size(
-                        dtype, vector_opt)
-                    min_block_size = 8
-                    if int(vector_opt):
-                        min_block_size >>= 2
-                        min_block_size <<= 2
-                        bs_inc = 4
-                    else:
-                        bs_inc = 1
-                    for block_size in range(min_block_size, max_block_size + 1,
-                                            bs_inc):
-                        self.info(
-                            "Testing %s dtype=%s precision_level=%s "
-                            "block_size=%d vector_opt=%s",
-                            krnnme, dtype, precision_level,
-                            block_size, vector_opt)
-                        try:
-                            with dummy.DummyWorkflow() as wf:
-                                u = benchmark(
-                                    wf, size=3001, repeats=3,
-                                    dtype=dtype,
-                                    precision_level=precision_level,
-                                    block_size=block_size,
-                                    vector_opt=vector_opt,
-                                    return_time=True, dry_run_first=True)
-                                u.initialize(self)
-                                dt = u.run()
-                        except cl.CLRuntimeError as e:
-                            self.exception("Failed to evaluate block size %d",
-                                           block_size)
-                            if e.code == -5:  # CL_OUT_OF_RESOURCES
-                                break
-                            else:
-                                continue
-                        finally:
-                            gc.collect()
-                        if dt < min_dt:
-                            min_dt = dt
-                            device_info[krnnme][dtype][precision_level] = (
-                                block_size, bool(int(vector_opt)), min_dt)
-        device_infos[self.device_info.desc] = device_info
+        self.info(
+            "Testing %s dtype=%s precision_level=%s block_size=%d "
+            "vector_opt=%s", krnnme, dtype, precision_level, block_size,
+            vector_opt)
+        try:
+            with dummy.DummyWorkflow() as wf:
+                u = benchmark(
+                    wf, size=OpenCLDevice.BENCHMARK_SIZE, repeats=3,
+                    dtype=dtype, precision_level=precision_level,
+                    block_size=block_size, vector_opt=vector_opt,
+                    return_time=True, dry_run_first=True, profile=profile)
+                u.initialize(self)
+                # Scale by the number of operations to keep the ratings
+                # comparable with the previously measured devices
+                return u.run() * (float(OpenCLDevice.BENCHMARK_REFERENCE_SIZE)
+                                  / OpenCLDevice.BENCHMARK_SIZE) ** 3
+        except cl.CLRuntimeError as e:
+            self.exception("Failed to evaluate block size %d", block_size)
+            if e.code == -5:  # CL_OUT_OF_RESOURCES
+                return False
+            return None
+        finally:
+            gc.collect()
 
     def _alloc_temp_buffer(self, size):
         # Allocate the buffer
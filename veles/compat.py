@@ -83,6 +83,11 @@ def from_none(exc):
         exc.__context__ = None
     return exc
 
+if six.PY3:
+    from shlex import quote as shlex_quote  # pylint: disable=W0611
+else:
+    from pipes import quote as shlex_quote  # pylint: disable=W0611
+
 if six.PY3:
     from enum import IntEnum  # pylint: disable=W0611
 else:
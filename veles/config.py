@@ -224,6 +224,10 @@ root.common.update({
         "root": "/usr/share/veles/web",
         "drop_time": 30 * 24 * 3600,
     },
+    "ssh": {
+        "connect_timeout": 10,
+        "keepalive_interval": 30,
+    },
     "api": {
         "port": 8180,
         "path": "/api"
@@ -249,6 +253,9 @@ root.common.update({
         "test_unknown_device": True,
         "test_precision_types": ("float", "double"),
         "test_precision_levels": (0, 1),
+        # Maximal number of kernel configurations to benchmark per dtype
+        # and precision level (0 means all of them)
+        "test_max_configs": 0,
         "thread_pool": {
             "minthreads": 2,
             "maxthreads": 2,
@@ -455,11 +455,17 @@ class DaemonContext(object):
                 exclude_descriptors.add(item.fileno())
             else:
                 exclude_descriptors.add(item)
-        for fd in os.listdir("/proc/self/fd"):
-            file = os.path.join("/proc/self/fd", fd)
-            if not os.path.exists(file):
+        try:
+            fds = os.listdir("/proc/self/fd")
+        except OSError:
+            # No procfs, there is nothing to detect
+            fds = []
+        for fd in fds:
+            try:
+                file = os.readlink(os.path.join("/proc/self/fd", fd))
+            except OSError:
+                # E.g., the descriptor of the listed directory itself
                 continue
-            file = os.readlink(file)
             if file in {"/dev/urandom", "/dev/random"}:
                 exclude_descriptors.add(int(fd))
         return exclude_descriptors
@@ -740,9 +746,21 @@ def close_all_open_files(exclude=set()):
         close.
 
         """
-    for fd in reversed([int(x) for x in os.listdir("/proc/self/fd")]):
-        if fd not in exclude:
-            close_file_descriptor_if_open(fd)
+    try:
+        maxfd = max(int(x) for x in os.listdir("/proc/self/fd")) + 1
+    except OSError:
+        maxfd = get_maximum_file_descriptors()
+    # os.closerange() maps to close_range(2) where available, so close the
+    # gaps between the excluded descriptors instead of fd by fd
+    low = 0
+    for fd in sorted(exclude):
+        if fd >= maxfd:
+            break
+        if fd > low:
+            os.closerange(low, fd)
+        low = max(low, fd + 1)
+    if low < maxfd:
+        os.closerange(low, maxfd)
 
 
 def redirect_stream(system_stream, target_stream):
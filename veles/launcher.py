@@ -36,6 +36,7 @@ under the License.
 
 
 import argparse
+from collections import namedtuple, OrderedDict
 import datetime
 import getpass
 from itertools import chain
@@ -51,51 +52,102 @@ import socket
 import sys
 import threading
 import time
-from twisted.internet import reactor
+
+import veles
+# Must go before twisted.internet.reactor is imported
+veles.install_reactor()
+from twisted.internet import defer, reactor, task, threads
+from twisted.internet.endpoints import TCP4ClientEndpoint
 from twisted.internet.error import ReactorNotRunning
+from twisted.internet.protocol import Factory, Protocol
 from twisted.web.html import escape
 from twisted.web.client import (Agent, HTTPConnectionPool, FileBodyProducer,
-                                getPage)
+                                getPage, readBody)
 from twisted.web.http_headers import Headers
 import uuid
 
 from veles.backends import Device, NumpyDevice
 from veles.client import Client as SlaveManager
 from veles.cmdline import CommandLineArgumentsRegistry, CommandLineBase
-from veles.compat import from_none
+from veles.compat import from_none, shlex_quote
 from veles.config import root
 import veles.graphics_server as graphics_server
 from veles.plotter import Plotter
 import veles.logger as logger
 from veles.server import Server as MasterManager
 from veles.thread_pool import ThreadPool
-from veles.external.pytrie import StringTrie
+
+try:
+    from orjson import dumps as dump_json
+except ImportError:
+    try:
+        from ujson import dumps as _dumps
+    except ImportError:
+        _dumps = json.dumps
+
+    def dump_json(obj):
+        return _dumps(obj).encode('charmap')
 
 
 def filter_argv(argv, *blacklist):
-    ptree = StringTrie({v: i for i, v in enumerate(blacklist)})
+    """
+    Removes the specified options together with their values from argv.
+    Whether an option takes a value is determined by the registered
+    command line parser, so "--opt=value", "-ovalue" and "-o [value]" forms
+    are recognized.
+    """
+    blacklist = set(blacklist)
+    actions = CommandLineBase.init_parser()._option_string_actions
     filtered = []
-    maybe_value = False
-    boolean_args = set(chain.from_iterable(
-        a.option_strings for a in CommandLineBase.init_parser()._actions
-        if isinstance(a, (argparse._StoreTrueAction,
-                          argparse._StoreFalseAction))))
     i = -1
     while i + 1 < len(argv):
         i += 1
         arg = argv[i]
-        has_value = arg.startswith("-") and arg not in boolean_args \
-            and '=' not in arg and arg != "-"
-        if ptree.longest_prefix(arg, None) is None:
+        if not arg.startswith("-") or arg == "-":
+            filtered.append(arg)
+            continue
+        if arg.startswith("--"):
+            option, eq, _ = arg.partition('=')
+            attached = bool(eq)
+        else:
+            option = arg[:2]
+            attached = len(arg) > 2
+        action = actions.get(option)
+        if attached:
+            has_value = False
+        elif action is None:
+            has_value = True
+        elif action.nargs == 0:
+            has_value = False
+        elif action.nargs == argparse.OPTIONAL:
+            has_value = i + 1 < len(argv) and \
+                not argv[i + 1].startswith("-")
+        else:
+            has_value = True
+        has_value &= i + 1 < len(argv)
+        if option not in blacklist:
             filtered.append(arg)
             if has_value:
-                i += 1
-                filtered.append(argv[i])
-        elif has_value:
+                filtered.append(argv[i + 1])
+        if has_value:
             i += 1
     return filtered
 
 
+class SlaveSpec(namedtuple("SlaveSpec", ("host", "devices"))):
+    """
+    Parsed remote node definition from --nodes.
+
+    Consists of the host name and the tuple of (backend, device) pairs, one
+    per slave to launch on that host (multipliers are already expanded).
+    """
+
+    @staticmethod
+    def parse(node):
+        host, devs = node.split('/')
+        return SlaveSpec(host, tuple(Device.iterparse(devs)))
+
+
 @add_metaclass(CommandLineArgumentsRegistry)
 class Launcher(logger.Logger):
     """Workflow launcher.
@@ -124,10 +176,17 @@ class Launcher(logger.Logger):
         self.args, _ = parser.parse_known_args(self.argv)
         self.args.master_address = self.args.master_address.strip()
         self.args.listen_address = self.args.listen_address.strip()
+        # The mode never changes, while it is queried very often
+        self._is_master = bool(self.args.listen_address)
+        self._is_slave = bool(self.args.master_address)
+        self._is_standalone = not self._is_master and not self._is_slave
+        self._mode = "master" if self._is_master else \
+            "slave" if self._is_slave else "standalone"
         self.testing = self.args.test
         self.args.matplotlib_backend = self.args.matplotlib_backend.strip()
         self._slaves = [x.strip() for x in self.args.nodes.split(',')
                         if x.strip() != ""]
+        self._slave_specs = [SlaveSpec.parse(node) for node in self.slaves]
         self._slave_launch_transform = self.args.slave_launch_transform
         if self._slave_launch_transform.find("%s") < 0:
             raise ValueError("Slave launch command transform must contain %s")
@@ -165,10 +224,14 @@ class Launcher(logger.Logger):
         self._start_time = None
         self._device = NumpyDevice()
         self._interactive = interactive
+        self._hostname = socket.gethostname()
+        self._ssh_pool = {}
+        self._web_status_pool = None
         self._reactor_thread = None
         self._notify_update_interval = kwargs.get(
             "status_update_interval",
             root.common.web.notification_interval)
+        self._slave_cmdline = None
         if self.args.yarn_nodes is not None and self.is_master:
             self._discover_nodes_from_yarn(self.args.yarn_nodes)
 
@@ -331,15 +394,15 @@ class Launcher(logger.Logger):
 
     @property
     def is_master(self):
-        return True if self.args.listen_address else False
+        return self._is_master
 
     @property
     def is_slave(self):
-        return True if self.args.master_address else False
+        return self._is_slave
 
     @property
     def is_standalone(self):
-        return not self.is_master and not self.is_slave
+        return self._is_standalone
 
     @property
     def is_main(self):
@@ -347,13 +410,7 @@ class Launcher(logger.Logger):
 
     @property
     def mode(self):
-        if self.is_master:
-            return "master"
-        if self.is_slave:
-            return "slave"
-        if self.is_standalone:
-            return "standalone"
-        raise RuntimeError("Impossible happened")
+        return self._mode
 
     @property
     def device(self):
@@ -393,7 +450,6 @@ class Launcher(logger.Logger):
         wrapped.__name__ = name + '_threadsafe'
         return wrapped
 
-    @threadsafe
     def add_ref(self, workflow):
         """
         Links with the nested Workflow instance, so that we are able to
@@ -450,9 +506,15 @@ class Launcher(logger.Logger):
         else:
             if self.reports_web_status:
                 timeout = self._notify_update_interval / 2
+                # Updates are sent one at a time, so a single kept-alive
+                # connection is enough
+                self._web_status_pool = HTTPConnectionPool(
+                    reactor, persistent=True)
+                self._web_status_pool.maxPersistentPerHost = 1
                 self._web_status_agent = Agent(
-                    reactor, pool=HTTPConnectionPool(reactor),
+                    reactor, pool=self._web_status_pool,
                     connectTimeout=timeout)
+                self._init_notify_status()
                 # Launch the status server if it's not been running yet
                 self._launch_status()
             if self.workflow.plotters_are_enabled and \
@@ -616,6 +678,8 @@ class Launcher(logger.Logger):
         self.workflow.thread_pool.resume()
 
     def launch_remote_progs(self, host, *progs, **kwargs):
+        if len(progs) == 0:
+            return
         self.info("Launching %d instance(s) on %s", len(progs), host)
         cwd = kwargs.get("cwd", os.getcwd())
         self.debug("launch_remote_progs: cwd: %s", cwd)
@@ -627,40 +691,79 @@ class Launcher(logger.Logger):
                 python_path += ":" + cwd
         if python_path is not None:
             self.debug("launch_remote_progs: PYTHONPATH: %s", python_path)
-            ppenv = "export PYTHONPATH='%s' && " % python_path
+            ppenv = "export PYTHONPATH=%s && " % shlex_quote(python_path)
         else:
             ppenv = ""
-        pc = paramiko.SSHClient()
         try:
-            pc.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            try:
-                pc.connect(host, look_for_keys=True, timeout=0.2)
-            except paramiko.ssh_exception.SSHException:
-                self.exception("Failed to connect to %s", host)
+            pc = self._get_ssh_client(host)
+            if pc is None:
                 return
             buf_size = 128
+            cwd = shlex_quote(cwd)
+            # progs are expected to be already quoted properly
+            cmds = [self._slave_launch_transform % ("cd %s && %s%s" %
+                                                    (cwd, ppenv, prog))
+                    for prog in progs]
+            # Start all of them at once in a single session instead of
+            # opening a channel per program
+            cmd = cmds[0] if len(cmds) == 1 else \
+                " & ".join(cmds) + " & wait"
+            self.debug("Executing %s", cmd)
             channel = pc.get_transport().open_session()
             channel.get_pty()
-            for prog in progs:
-                prog = prog.replace(r'"', r'\"').replace(r"'", r"\'")
-                cmd = self._slave_launch_transform % ("cd '%s' && %s%s" %
-                                                      (cwd, ppenv, prog))
-                self.debug("Executing %s", cmd)
-                channel.exec_command(cmd)
-                answer = channel.recv(buf_size)
-                if answer:
+            channel.exec_command(cmd)
+            answer = channel.recv(buf_size)
+            if answer:
+                buf = channel.recv(buf_size)
+                while buf:
+                    answer += buf
                     buf = channel.recv(buf_size)
-                    while buf:
-                        answer += buf
-                        buf = channel.recv(buf_size)
-                    self.warning("SSH returned:\n%s", answer.decode('utf-8'))
+                self.warning("SSH returned:\n%s", answer.decode('utf-8'))
             channel.close()
-        except:
+        except (paramiko.SSHException, socket.error):
             self.exception("Failed to launch '%s' on %s", progs, host)
-        finally:
+            self._drop_ssh_client(host)
+
+    def _get_ssh_client(self, host):
+        """
+        Returns the cached SSH connection to the specified host, establishing
+        a new one if it does not exist yet or is no longer active.
+        """
+        pc = self._ssh_pool.get(host)
+        if pc is not None:
+            transport = pc.get_transport()
+            if transport is not None and transport.is_active():
+                return pc
+            self._drop_ssh_client(host)
+        pc = paramiko.SSHClient()
+        pc.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        try:
+            pc.connect(host, look_for_keys=True,
+                       timeout=root.common.ssh.connect_timeout)
+        except (paramiko.SSHException, socket.error) as e:
+            self.error("Failed to connect to %s: %s", host, e)
+            pc.close()
+            return None
+        except:
+            pc.close()
+            raise
+        # Prevent NAT and firewalls from dropping the idle pooled connection
+        pc.get_transport().set_keepalive(root.common.ssh.keepalive_interval)
+        # Another thread might have connected to the same host meanwhile
+        pooled = self._ssh_pool.setdefault(host, pc)
+        if pooled is not pc:
             pc.close()
+        return pooled
+
+    def _drop_ssh_client(self, host):
+        pc = self._ssh_pool.pop(host, None)
+        if pc is not None:
+            pc.close()
+
+    def _close_ssh_pool(self):
+        for host in list(self._ssh_pool):
+            self._drop_ssh_client(host)
 
-    @threadsafe
     def _pre_run(self):
         if not self._initialized:
             raise RuntimeError("Launcher was not initialized")
@@ -669,8 +772,7 @@ class Launcher(logger.Logger):
         self._running = True
         self._start_time = time.time()
         if self.reports_web_status:
-            self._notify_update_last_time = self.start_time
-            self._notify_status()
+            self._notify_task.start(self._notify_update_interval, now=False)
         if not self.is_slave:
             def run_workflow():
                 self.workflow.stopped = False
@@ -680,22 +782,38 @@ class Launcher(logger.Logger):
         self.event("work", "begin", height=0.1)
 
     def _on_stop(self):
-        if self.workflow is None or not self._initialized:
+        if self.workflow is None:
             return
-        self._on_stop_locked()
-
-    @threadsafe
-    def _on_stop_locked(self):
+        with self._lock:
+            # stop() and the reactor shutdown trigger may race each other,
+            # so the first one to get here tears everything down; the lock
+            # is not held during the teardown itself
+            if not self._initialized:
+                return
+            self._initialized = False
+            self._running = False
         if self.args.pdb_on_finish:
             import pdb
             pdb.set_trace()
         self.info("Stopping everything (%s mode)", self.mode)
-        self._initialized = False
-        self._running = False
         # Wait for the own graphics client to terminate normally
+        if reactor.running and threading.current_thread().ident == \
+                getattr(self, "_reactor_thread_ident", None):
+            # Let the reactor keep spinning meanwhile; the shutdown trigger
+            # waits for the returned Deferred
+            return self._stop_graphics_async().addCallback(
+                lambda _: self._finish_stop())
         self._stop_graphics()
+        self._finish_stop()
+
+    def _finish_stop(self):
+        if self.reports_web_status and self._notify_task.running:
+            self._notify_task.stop()
         if not self.is_standalone:
             self.agent.close()
+        self._close_ssh_pool()
+        if self._web_status_pool is not None:
+            self._web_status_pool.closeCachedConnections()
         self.workflow.thread_pool.shutdown()
 
     threadsafe = staticmethod(threadsafe)
@@ -733,33 +851,65 @@ class Launcher(logger.Logger):
         if Launcher.graphics_client is not None:
             attempt = 0
             while Launcher.graphics_client.poll() is None and attempt < 10:
-                if attempt == 1:
-                    self.info("Signalling the graphics client to finish "
-                              "normally...")
-                Launcher.graphics_server.shutdown()
+                self._signal_graphics_client(attempt)
                 attempt += 1
                 time.sleep(0.2)
-            if Launcher.graphics_client.poll() is None:
-                Launcher.graphics_client.terminate()
-                self.info("Waiting for the graphics client to finish after "
-                          "SIGTERM...")
-                try:
-                    Launcher.graphics_client.wait(0.5)
-                    self.info("Graphics client has been terminated")
-                except subprocess.TimeoutExpired:
-                    os.kill(Launcher.graphics_client.pid, signal.SIGKILL)
-                    self.info("Graphics client has been killed")
-            else:
-                self.info("Graphics client returned normally")
+            self._finish_graphics_client()
+
+    def _stop_graphics_async(self):
+        """
+        Does the same as _stop_graphics(), but polls the graphics client from
+        the reactor instead of sleeping, so it must be called on the reactor
+        thread. Returns the Deferred which fires when the client has exited.
+        """
+        if self.interactive or Launcher.graphics_client is None:
+            return defer.succeed(None)
+        attempts = iter(range(10))
+
+        def check_graphics_exit():
+            attempt = next(attempts, None)
+            if Launcher.graphics_client.poll() is not None or attempt is None:
+                poll.stop()
+                return
+            self._signal_graphics_client(attempt)
+
+        poll = task.LoopingCall(check_graphics_exit)
+        return poll.start(0.2).addCallback(
+            lambda _: self._finish_graphics_client())
+
+    def _signal_graphics_client(self, attempt):
+        if attempt == 1:
+            self.info("Signalling the graphics client to finish normally...")
+        Launcher.graphics_server.shutdown()
+
+    def _finish_graphics_client(self):
+        if Launcher.graphics_client.poll() is None:
+            Launcher.graphics_client.terminate()
+            self.info("Waiting for the graphics client to finish after "
+                      "SIGTERM...")
+            try:
+                Launcher.graphics_client.wait(0.5)
+                self.info("Graphics client has been terminated")
+            except subprocess.TimeoutExpired:
+                os.kill(Launcher.graphics_client.pid, signal.SIGKILL)
+                self.info("Graphics client has been killed")
+        else:
+            self.info("Graphics client returned normally")
 
     def _generate_workflow_graphs(self):
         if not self.is_slave and self.reports_web_status:
-            try:
-                self.workflow_graph, _ = self.workflow.generate_graph(
-                    filename=None, write_on_disk=False, with_data_links=True)
-            except RuntimeError as e:
-                self.warning("Failed to generate the workflow graph: %s", e)
-                self.workflow_graph = ""
+            self.workflow_graph = ""
+            # Inspect the units now, before they are initialized
+            graph = self.workflow.collect_graph(with_data_links=True)
+            if self.is_master:
+                # Master never creates a device, so there is no need to
+                # block on rendering; status updates go without the graph
+                # until it is ready
+                threads.deferToThread(
+                    self._generate_workflow_graph, graph).addCallbacks(
+                    self._set_workflow_graph, self._on_workflow_graph_error)
+            else:
+                self._set_workflow_graph(self._generate_workflow_graph(graph))
         units_wanting_graph = [u for u in self.workflow
                                if getattr(u, "wants_workflow_graph", False)]
         if len(units_wanting_graph) > 0:
@@ -777,6 +927,20 @@ class Launcher(logger.Logger):
                         wfgf.seek(0, os.SEEK_SET)
                         unit.workflow_graphs[fmt] = wfgf.read()
 
+    def _generate_workflow_graph(self, graph):
+        try:
+            return self.workflow.render_graph(graph, write_on_disk=False)[0]
+        except RuntimeError as e:
+            self.warning("Failed to generate the workflow graph: %s", e)
+            return ""
+
+    def _set_workflow_graph(self, graph):
+        self.workflow_graph = graph
+
+    def _on_workflow_graph_error(self, failure):
+        self.error("Failed to generate the workflow graph:\n%s",
+                   failure.getTraceback())
+
     def _print_stats(self):
         self.workflow.print_stats()
         if self.agent is not None:
@@ -789,28 +953,33 @@ class Launcher(logger.Logger):
     def _launch_status(self):
         if not self.reports_web_status:
             return
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        result = sock.connect_ex((root.common.web.host,
-                                  root.common.web.port))
-        sock.close()
-        if result != 0:
-            self.info("Launching the web status server")
-            self.launch_remote_progs(
-                root.common.web.host,
-                "PYTHONPATH=%s %s 2>>%s" %
-                (os.path.dirname(root.common.dirs.veles),
-                 os.path.join(root.common.dirs.veles, "web_status.py"),
-                 "%s.stderr%s" %
-                 os.path.splitext(root.common.web.log_file)))
-        else:
-            self.info("Web status server %s:%d is already running",
-                      root.common.web.host, root.common.web.port)
-
-    def _launch_nodes(self):
-        if len(self.slaves) == 0:
-            return
-        self.debug("Will launch the following slaves: %s",
-                   ', '.join(self.slaves))
+        # Probe the status server asynchronously instead of blocking in
+        # connect() - the host may be remote or even unreachable
+        endpoint = TCP4ClientEndpoint(reactor, root.common.web.host,
+                                      root.common.web.port, timeout=1)
+        endpoint.connect(Factory.forProtocol(Protocol)).addCallbacks(
+            self._on_status_server_found, self._on_status_server_missing)
+
+    def _on_status_server_found(self, protocol):
+        protocol.transport.loseConnection()
+        self.info("Web status server %s:%d is already running",
+                  root.common.web.host, root.common.web.port)
+
+    def _on_status_server_missing(self, failure):
+        self.info("Launching the web status server")
+        threads.deferToThread(
+            self.launch_remote_progs, root.common.web.host,
+            "PYTHONPATH=%s %s 2>>%s" % tuple(shlex_quote(s) for s in (
+                os.path.dirname(root.common.dirs.veles),
+                os.path.join(root.common.dirs.veles, "web_status.py"),
+                "%s.stderr%s" % os.path.splitext(root.common.web.log_file)))
+        ).addErrback(self._on_launch_error, root.common.web.host)
+
+    def _build_slave_cmdline(self):
+        """
+        Returns the command line template to launch a slave. It contains
+        two placeholders: for the backend and for the device.
+        """
         filtered_argv = filter_argv(
             sys.argv, "-l", "--listen-address", "-n", "--nodes", "-p",
             "--matplotlib-backend", "-b", "--background", "-s", "--stealth",
@@ -821,26 +990,49 @@ class Launcher(logger.Logger):
         port = self.args.listen_address[len(host) + 1:]
         # No way we can send 'localhost' or empty host name to a slave.
         if not host or host in ("0.0.0.0", "localhost", "127.0.0.1"):
-            host = socket.gethostname()
-        filtered_argv.insert(0, "-m %s:%s -b -i \"%s\"" %
-                             (host, port, self.log_id))
-        slave_args = " ".join(filtered_argv)
+            host = self._hostname
+        slave_args = " ".join(shlex_quote(arg) for arg in chain(
+            ("-m", "%s:%s" % (host, port), "-b", "-i", self.log_id),
+            filtered_argv))
         self.debug("Slave args: %s", slave_args)
+        cmdline = "%s %s" % (shlex_quote(sys.executable),
+                             shlex_quote(os.path.abspath(sys.argv[0]))) + \
+            " --backend %s --device %s " + slave_args.replace("%", "%%")
+        if self.args.log_file:
+            cmdline += " &>> " + \
+                shlex_quote(self.args.log_file).replace("%", "%%")
+        return cmdline
+
+    def _launch_nodes(self):
+        if len(self.slaves) == 0:
+            return
+        self.debug("Will launch the following slaves: %s",
+                   ', '.join(self.slaves))
+        if self._slave_cmdline is None:
+            self._slave_cmdline = self._build_slave_cmdline()
         total_slaves = 0
         max_slaves = self.args.max_nodes or 1000
-        cmdline = "%s %s" % (sys.executable, os.path.abspath(sys.argv[0])) + \
-            " --backend %s --device %s " + slave_args
-        if self.args.log_file:
-            cmdline += " &>> " + self.args.log_file
-        for node in self.slaves:
-            host, devs = node.split('/')
-            progs = [cmdline % dev for dev in Device.iterparse(devs)]
+        progs_by_host = OrderedDict()
+        for spec in self._slave_specs:
+            progs = [self._slave_cmdline % dev for dev in spec.devices]
             if total_slaves + len(progs) > max_slaves:
                 progs = progs[:max_slaves - total_slaves]
             total_slaves += len(progs)
-            self.launch_remote_progs(host, *progs)
+            progs_by_host.setdefault(spec.host, []).extend(progs)
             if total_slaves >= max_slaves:
                 break
+        # SSH handshakes with different hosts are independent, so overlap them
+        launches = [threads.deferToThread(self.launch_remote_progs, host,
+                                          *progs)
+                    .addErrback(self._on_launch_error, host)
+                    for host, progs in progs_by_host.items()]
+        defer.DeferredList(launches).addCallback(
+            lambda _: self.debug("Launched %d slave(s) on %d host(s)",
+                                 total_slaves, len(progs_by_host)))
+
+    def _on_launch_error(self, failure, host):
+        self.error("Failed to launch the program(s) on %s:\n%s", host,
+                   failure.getTraceback())
 
     def _set_webagg_port(self, port):
         self.info("Found out the WebAgg port: %d", port)
@@ -848,42 +1040,66 @@ class Launcher(logger.Logger):
 
     def _on_notify_status_error(self, error):
         self.warning("Failed to upload the status: %s", error)
-        reactor.callLater(self._notify_update_interval, self._notify_status)
 
-    def _notify_status(self, response=None):
+    def _on_notify_status_done(self, _):
+        self._notify_pending = False
+
+    def _notify_status(self, count):
         if not self._running:
             return
-        time_passed = time.time() - self._notify_update_last_time
-        if time_passed < self._notify_update_interval:
-            reactor.callLater(self._notify_update_interval - time_passed,
-                              self._notify_status)
+        if count > 1:
+            # LoopingCall.withCount() collapses the missed calls into one
+            self.warning("The reactor is lagging: skipped %d status "
+                         "update(s)", count - 1)
+        if self._notify_pending:
+            self.debug("The previous status update is still in progress")
             return
-        self._notify_update_last_time = time.time()
+        self._notify_pending = True
         mins, secs = divmod(time.time() - self.start_time, 60)
         hours, mins = divmod(mins, 60)
-        ret = {'id': self.id,
-               'log_id': self.log_id,
-               'name': self.workflow.name,
-               'master': socket.gethostname(),
-               'time': "%02d:%02d:%02d" % (hours, mins, secs),
-               'user': getpass.getuser(),
-               'graph': self.workflow_graph,
-               'log_addr': self.mongo_log_addr,
-               'slaves': self._agent.nodes if self.is_master else [],
-               'plots': "http://%s:%d" % (socket.gethostname(),
-                                          self.webagg_port),
-               'custom_plots': "<br/>".join(self.plots_endpoints),
-               'description':
-               "<br />".join(escape(self.workflow.__doc__ or "").split("\n"))}
-        url = "http://%s:%d/update" % (root.common.web.host,
-                                       root.common.web.port)
-        headers = Headers({b'User-Agent': [b'twisted']})
-        body = FileBodyProducer(BytesIO(json.dumps(ret).encode('charmap')))
-        self.debug("Uploading status update to %s", url)
+        ret = self._notify_body
+        ret['time'] = "%02d:%02d:%02d" % (hours, mins, secs)
+        ret['slaves'] = self._agent.nodes if self.is_master else []
+        ret['plots'] = "http://%s:%d" % (self._hostname, self.webagg_port)
+        ret['custom_plots'] = "<br/>".join(self.plots_endpoints)
+        if self._notify_graph[0] is not self.workflow_graph:
+            # The graph may be large and it rarely changes, so serialize it
+            # separately and splice into the body
+            self._notify_graph = (self.workflow_graph,
+                                  dump_json(self.workflow_graph))
+        body = FileBodyProducer(BytesIO(
+            dump_json(ret)[:-1] + b', "graph": ' + self._notify_graph[1] +
+            b'}'))
+        self.debug("Uploading status update to %s", self._notify_url)
         d = self._web_status_agent.request(
-            b'POST', url.encode('ascii'), headers=headers, bodyProducer=body)
-        d.addCallback(self._notify_status)
+            b'POST', self._notify_url, headers=self._notify_headers,
+            bodyProducer=body)
+        # The connection returns to the pool only after the response body
+        # has been read completely
+        d.addCallback(readBody)
         d.addErrback(self._on_notify_status_error)
+        d.addBoth(self._on_notify_status_done)
+
+    def _init_notify_status(self):
+        """
+        Precomputes everything in the status update which does not change
+        during the run, so that _notify_status() only fills the rest.
+        """
+        self._notify_url = ("http://%s:%d/update" % (
+            root.common.web.host, root.common.web.port)).encode('ascii')
+        self._notify_headers = Headers({b'User-Agent': [b'twisted']})
+        self._notify_graph = (None, b'null')
+        self._notify_pending = False
+        self._notify_task = task.LoopingCall.withCount(self._notify_status)
+        self._notify_body = {
+            'id': self.id,
+            'log_id': self.log_id,
+            'name': self.workflow.name,
+            'master': self._hostname,
+            'user': getpass.getuser(),
+            'log_addr': self.mongo_log_addr,
+            'description':
+            "<br />".join(escape(self.workflow.__doc__ or "").split("\n"))}
 
     def _discover_nodes_from_yarn(self, address):
         if address.find(':') < 0:
@@ -903,5 +1119,7 @@ class Launcher(logger.Logger):
         self.debug("Received YARN response: %s", rstr)
         tree = json.loads(rstr)
         for node in tree["nodes"]["node"]:
-            self._slaves.append(node["nodeHostName"] + "/0:0")
+            node = node["nodeHostName"] + "/0:0"
+            self._slaves.append(node)
+            self._slave_specs.append(SlaveSpec.parse(node))
         reactor.callLater(0, self._launch_nodes)
@@ -50,7 +50,7 @@ from veles.compat import from_none
 from veles.distributable import Pickleable
 from veles.numpy_ext import (  # pylint: disable=W0611
     max_type, eq_addr, assert_addr, ravel, reshape, reshape_transposed,
-    transpose, interleave, roundup, NumDiff)
+    transpose, interleave, roundup, aligned_empty, NumDiff)
 
 
 class WatcherMeta(type):
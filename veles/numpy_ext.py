@@ -113,6 +113,17 @@ def roundup(num, align):
     return num + (align - d)
 
 
+def aligned_empty(shape, dtype, align):
+    """Allocates an uninitialized array which data address is a multiple
+    of align bytes.
+    """
+    dtype = numpy.dtype(dtype)
+    nbytes = int(numpy.prod(shape)) * dtype.itemsize
+    raw = numpy.empty(nbytes + align, dtype=numpy.uint8)
+    offset = (-raw.ctypes.data) % align
+    return raw[offset:offset + nbytes].view(dtype).reshape(shape)
+
+
 class NumDiff(object):
     """Numeric differentiation helper.
 
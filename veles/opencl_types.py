@@ -49,30 +49,22 @@ cl_defines = {"float":      {"dtype": "float",
 dtypes = {"float": numpy.float32, "double": numpy.float64}
 
 
+# : numpy dtype => OpenCL type name.
+numpy_to_opencl = {numpy.dtype(t): name for t, name in (
+    (numpy.float32, "float"), (numpy.float64, "double"),
+    (numpy.complex64, "float2"), (numpy.complex128, "double2"),
+    (numpy.int8, "char"), (numpy.int16, "short"),
+    (numpy.int32, "int"), (numpy.int64, "long"),
+    (numpy.uint8, "uchar"), (numpy.uint16, "ushort"),
+    (numpy.uint32, "uint"), (numpy.uint64, "ulong"))}
+
+
 # : Map between numpy types and opencl.
 def numpy_dtype_to_opencl(dtype):
-    if dtype == numpy.float32:
-        return "float"
-    if dtype == numpy.float64:
-        return "double"
-    if dtype == numpy.complex64:
-        return "float2"
-    if dtype == numpy.complex128:
-        return "double2"
-    if dtype == numpy.int8:
-        return "char"
-    if dtype == numpy.int16:
-        return "short"
-    if dtype == numpy.int32:
-        return "int"
-    if dtype == numpy.int64:
-        return "long"
-    if dtype == numpy.uint8:
-        return "uchar"
-    if dtype == numpy.uint16:
-        return "ushort"
-    if dtype == numpy.uint32:
-        return "uint"
-    if dtype == numpy.uint64:
-        return "ulong"
+    # numpy.dtype() would also accept type names and Python types
+    if isinstance(dtype, numpy.dtype) or (
+            isinstance(dtype, type) and issubclass(dtype, numpy.generic)):
+        name = numpy_to_opencl.get(numpy.dtype(dtype))
+        if name is not None:
+            return name
     raise ValueError("Unknown dtype: %s" % dtype)
@@ -91,15 +91,23 @@ def get_diffs(first_units, second_units):
                 assert second_val.mem is None
                 continue
             diff = first_val.mem - second_val.mem
-            avg_diff = numpy.mean(numpy.abs(diff), dtype=numpy.float64)
             val_sum = first_val.mem + second_val.mem
             nz = numpy.nonzero(val_sum)
-            rel = 2 * (diff[nz] / val_sum[nz])
+            rel = diff[nz] / val_sum[nz]
+            # The absolute value of a complex array is real, so it can not
+            # be stored in place
+            if numpy.iscomplexobj(diff):
+                diff = numpy.abs(diff)
+                rel = numpy.abs(rel)
+            else:
+                numpy.abs(diff, out=diff)
+                numpy.abs(rel, out=rel)
+            avg_diff = numpy.mean(diff, dtype=numpy.float64)
             if len(rel) > 0:
-                avg_rel_diff = numpy.mean(numpy.abs(rel), dtype=numpy.float64)
+                avg_rel_diff = 2 * numpy.mean(rel, dtype=numpy.float64)
             else:
-                avg_rel_diff = float(not (diff == 0).all())
-            max_diff = numpy.max(numpy.abs(diff))
+                avg_rel_diff = float(diff.any())
+            max_diff = numpy.max(diff)
             yield index, first_unit.name, key, avg_rel_diff, avg_diff, max_diff
 
 
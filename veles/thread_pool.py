@@ -35,7 +35,6 @@ under the License.
 
 from __future__ import print_function
 import argparse
-from copy import copy
 import functools
 import logging
 import signal
@@ -45,7 +44,6 @@ from six import add_metaclass
 import sys
 import threading
 from traceback import print_stack
-import types
 from twisted.internet import reactor
 from twisted.python import threadpool
 import weakref
@@ -270,7 +268,7 @@ class ThreadPool(threadpool.ThreadPool, logger.Logger):
 
     @staticmethod
     def _iter_weak(iterable):
-        for obj in copy(iterable):
+        for obj in tuple(iterable):
             if isinstance(obj, weakref.ReferenceType):
                 obj = obj()
                 if obj is not None:
@@ -301,13 +299,6 @@ class ThreadPool(threadpool.ThreadPool, logger.Logger):
                 return
             self.warning("remove_callback: %s was not found in %s", func, cont)
 
-    @staticmethod
-    def _put(self, item):
-        """
-        Private method used by shutdown() to redefine Queue's _put().
-        """
-        self.queue.appendleft(item)
-
     def _stopping_call(self, method, *args, **kwargs):
         if self._stopping:
             return
@@ -321,9 +312,14 @@ class ThreadPool(threadpool.ThreadPool, logger.Logger):
         self._not_paused.set()
         self.started = False
         self._stopping = True
-        threads = copy(self.threads)
+        threads = list(self.threads)
         if not execute_remaining:
-            self.q._put = types.MethodType(ThreadPool._put, self.q)
+            # Drop the pending work so that WorkerStop-s go first
+            while True:
+                try:
+                    self.q.get_nowait()
+                except queue.Empty:
+                    break
         for _ in range(self.workers):
             self.q.put(threadpool.WorkerStop)
         tmap = {thr.ident: thr.name for thr in threading.enumerate()}
@@ -368,7 +364,7 @@ class ThreadPool(threadpool.ThreadPool, logger.Logger):
                 # The weakly referenced object no longer exists
                 skipped += 1
                 continue
-            self.debug("%d/%d - %s", ind + 1, sdl, str(on_shutdown))
+            self.debug("%d/%d - %r", ind + 1, sdl, on_shutdown)
             try:
                 on_shutdown()
             except:
@@ -380,7 +376,7 @@ class ThreadPool(threadpool.ThreadPool, logger.Logger):
         ThreadPool.pools.remove(self)
         if not len(ThreadPool.pools):
             sys.exit = ThreadPool.__dict__["sysexit_initial"]
-        self.debug("%s was shutted down", repr(self))
+        self.debug("%r was shutted down", self)
 
     @staticmethod
     def thread_can_be_forced_to_stop(thread):
@@ -402,7 +398,7 @@ class ThreadPool(threadpool.ThreadPool, logger.Logger):
         """
         if ThreadPool.pools is None:
             return
-        pools = copy(ThreadPool.pools)
+        pools = list(ThreadPool.pools)
         logging.getLogger("ThreadPool").debug(
             "Shutting down %d pools...", len(pools))
         for pool in pools:
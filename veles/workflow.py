@@ -620,6 +620,16 @@ class Workflow(Container):
         If write_on_disk is False, filename is ignored. If filename is None, a
         temporary file name is taken.
         """
+        return self.render_graph(
+            self.collect_graph(with_data_links, background), filename,
+            write_on_disk, quiet)
+
+    def collect_graph(self, with_data_links=False, background="transparent"):
+        """Gathers the units and the links between them for render_graph().
+        This is the only part of generate_graph() which inspects the units,
+        so it must be called while they do not change; the result can be
+        rendered in any thread.
+        """
         g = pydot.Dot(graph_name="Workflow",
                       graph_type="digraph",
                       bgcolor=background,
@@ -661,7 +671,55 @@ class Workflow(Container):
                 g.add_edge(pydot.Edge(src_id, dst_id, penwidth=3, weight=100))
                 if link not in visited_units and link not in boilerplate:
                     boilerplate.add(link)
-        if with_data_links:
+        units = {hex(id(unit)): str(unit) for unit in self}
+        if not with_data_links:
+            return g, None, units
+        data_links = []
+        attrs = defaultdict(list)
+        refs = []
+        for unit in self:
+            for key, val in unit.__dict__.items():
+                if key.startswith('__') and hasattr(unit, key[2:]) and \
+                   LinkableAttribute.__is_reference__(val):
+                    refs.append((unit, key[2:]) + val)
+                if (val is not None and not Unit.is_immutable(val) and
+                        key not in Workflow.HIDDEN_UNIT_ATTRS and
+                        not key.endswith('_') and
+                        self.filter_unit_graph_attrs(val)):
+                    try:
+                        if key[0] == '_' and hasattr(unit, key[1:]):
+                            key = key[1:]
+                    except AssertionError:
+                        key = key[1:]
+                    attrs[id(val)].append((unit, key))
+        for ref in refs:
+            data_links.append(pydot.Edge(
+                hex(id(ref[0])), hex(id(ref[2])), constraint="false",
+                label=('"%s"' % ref[1]) if ref[1] == ref[3]
+                else '"%s -> %s"' % (ref[1], ref[3]),
+                fontcolor='gray', fontsize="8.0", color='gray'))
+        for vals in attrs.values():
+            if len(vals) > 1:
+                for val1 in vals:
+                    for val2 in vals:
+                        if val1[0] == val2[0]:
+                            continue
+                        label = ('"%s"' % val1[1]) if val1[1] == val2[1] \
+                            else '"%s:%s"' % (val1[1], val2[1])
+                        data_links.append(pydot.Edge(
+                            hex(id(val1[0])), hex(id(val2[0])), weight=0,
+                            label=label, dir="both", color='gray',
+                            fontcolor='gray', fontsize="8.0",
+                            constraint="false"))
+        return g, data_links, units
+
+    def render_graph(self, graph, filename=None, write_on_disk=True,
+                     quiet=False):
+        """Lays out the result of collect_graph() and optionally writes it to
+        disk. Returns the DOT graph description (string) and the file name.
+        """
+        g, data_links, units = graph
+        if data_links is not None:
             # Add data links
             # Circo does not allow to ignore certain edges, so we need to save
             # the intermediate result
@@ -671,43 +729,8 @@ class Workflow(Container):
             os.remove(dotfile)
             # Neato without changing the layout
             g.set_prog("neato -n")
-
-            attrs = defaultdict(list)
-            refs = []
-            for unit in self:
-                for key, val in unit.__dict__.items():
-                    if key.startswith('__') and hasattr(unit, key[2:]) and \
-                       LinkableAttribute.__is_reference__(val):
-                        refs.append((unit, key[2:]) + val)
-                    if (val is not None and not Unit.is_immutable(val) and
-                            key not in Workflow.HIDDEN_UNIT_ATTRS and
-                            not key.endswith('_') and
-                            self.filter_unit_graph_attrs(val)):
-                        try:
-                            if key[0] == '_' and hasattr(unit, key[1:]):
-                                key = key[1:]
-                        except AssertionError:
-                            key = key[1:]
-                        attrs[id(val)].append((unit, key))
-            for ref in refs:
-                g.add_edge(pydot.Edge(
-                    hex(id(ref[0])), hex(id(ref[2])), constraint="false",
-                    label=('"%s"' % ref[1]) if ref[1] == ref[3]
-                    else '"%s -> %s"' % (ref[1], ref[3]),
-                    fontcolor='gray', fontsize="8.0", color='gray'))
-            for vals in attrs.values():
-                if len(vals) > 1:
-                    for val1 in vals:
-                        for val2 in vals:
-                            if val1[0] == val2[0]:
-                                continue
-                            label = ('"%s"' % val1[1]) if val1[1] == val2[1] \
-                                else '"%s:%s"' % (val1[1], val2[1])
-                            g.add_edge(pydot.Edge(
-                                hex(id(val1[0])), hex(id(val2[0])), weight=0,
-                                label=label, dir="both", color='gray',
-                                fontcolor='gray', fontsize="8.0",
-                                constraint="false"))
+            for edge in data_links:
+                g.add_edge(edge)
         if write_on_disk:
             if not filename:
                 try:
@@ -728,11 +751,11 @@ class Workflow(Container):
                 error_marker = "Error: node "
                 hex_pos = e.value.find(error_marker) + len(error_marker)
                 buggy_id = e.value[hex_pos:hex_pos + len(hex(id(self)))]
-                buggy_unit = next(u for u in self if hex(id(u)) == buggy_id)
                 self.warning("Looks like %s is not properly linked, unable to "
-                             "draw the data links.", buggy_unit)
-                return self.generate_graph(filename, write_on_disk, False,
-                                           background)
+                             "draw the data links.",
+                             units.get(buggy_id, buggy_id))
+                return self.render_graph((graph[0], None, units), filename,
+                                         write_on_disk, quiet)
             if not quiet:
                 self.info("Saved the workflow graph to %s", filename)
         desc = g.to_string().strip()